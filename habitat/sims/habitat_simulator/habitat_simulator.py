@@ -16,6 +16,7 @@ from typing import (
     cast,
 )
 
+import numba
 import numpy as np
 import math
 import magnum as mn
@@ -45,12 +46,93 @@ from habitat.core.simulator import (
 )
 from habitat.core.spaces import Space
 from habitat_sim.nav import NavMeshSettings
-from habitat_sim.utils.common import quat_from_coeffs, quat_to_magnum
+from habitat_sim.utils.common import quat_to_magnum
 from habitat_sim.physics import MotionType
 
 RGBSENSOR_DIMENSION = 3
 
 
+@numba.njit(cache=True)
+def _seed_numba(seed: int):
+    r"""Numba's nopython RNG keeps its own state that python-level
+    ``random.seed`` does not touch; it must be seeded separately for
+    :ref:`_random_y_rotation_components` to be reproducible.
+    """
+    random.seed(seed)
+
+
+@numba.njit(cache=True, fastmath=True)
+def _random_y_rotation_components():
+    r"""Samples a uniform rotation angle about Y and returns the (scalar,
+    y) quaternion components, keeping the trig + RNG work out of the
+    interpreter for the rejection-sampling loop in
+    :ref:`HabitatSim.sample_object_state`.
+    """
+    half_theta = random.random() * math.pi
+    return math.cos(half_theta), math.sin(half_theta)
+
+
+@numba.njit(parallel=True, fastmath=True, cache=True)
+def _depth_postprocess(
+    obs: ndarray,
+    out: ndarray,
+    min_depth: float,
+    max_depth: float,
+    inv_range: float,
+    normalize: bool,
+) -> None:
+    r"""Fused clip + expand + normalize for depth frames. Writes the final
+    HxWx1 result into ``out`` in a single pass instead of materializing a
+    temporary array per NumPy op.
+    """
+    for i in numba.prange(obs.shape[0]):
+        for j in range(obs.shape[1]):
+            v = obs[i, j]
+            if v < min_depth:
+                v = min_depth
+            elif v > max_depth:
+                v = max_depth
+            if normalize:
+                v = (v - min_depth) * inv_range
+            out[i, j, 0] = v
+
+
+def _if_config_to_lower(config: Any) -> Any:
+    if isinstance(config, Config):
+        return {key.lower(): val for key, val in config.items()}
+    else:
+        return config
+
+
+_SETTER_CACHE: Dict[tuple, Any] = {}
+
+
+def _get_setter(config_from: Config, config_to: Any) -> Any:
+    r"""Builds (and caches) a setter specialized for the given pair of config
+    shapes. The generated function is straight-line ``config_to.x =
+    config_from['X']`` assignments, so repeated calls skip the per-attribute
+    ``hasattr`` probes of the reflective path.
+    """
+    key = (frozenset(config_from.keys()), type(config_to))
+    setter = _SETTER_CACHE.get(key)
+    if setter is None:
+        lines = ["def _set(config_from, config_to):"]
+        for attr in config_from.keys():
+            low = attr.lower()
+            if hasattr(config_to, low):
+                lines.append(
+                    "    config_to.{} = _if_config_to_lower("
+                    "config_from['{}'])".format(low, attr)
+                )
+        if len(lines) == 1:
+            lines.append("    pass")
+        namespace = {"_if_config_to_lower": _if_config_to_lower}
+        exec("\n".join(lines), namespace)
+        setter = namespace["_set"]
+        _SETTER_CACHE[key] = setter
+    return setter
+
+
 def overwrite_config(config_from: Config, config_to: Any) -> None:
     r"""Takes Habitat Lab config and Habitat-Sim config structures. Overwrites
     Habitat-Sim config with Habitat Lab values, where a field name is present
@@ -61,16 +143,7 @@ def overwrite_config(config_from: Config, config_to: Any) -> None:
         config_from: Habitat Lab config node.
         config_to: Habitat-Sim config structure.
     """
-
-    def if_config_to_lower(config):
-        if isinstance(config, Config):
-            return {key.lower(): val for key, val in config.items()}
-        else:
-            return config
-
-    for attr, value in config_from.items():
-        if hasattr(config_to, attr.lower()):
-            setattr(config_to, attr.lower(), if_config_to_lower(value))
+    _get_setter(config_from, config_to)(config_from, config_to)
 
 
 @registry.register_sensor
@@ -93,7 +166,18 @@ class HabitatSimRGBSensor(RGBSensor):
         self, sim_obs: Dict[str, Union[ndarray, bool, "Tensor"]]
     ) -> VisualObservation:
         obs = cast(Optional[VisualObservation], sim_obs.get(self.uuid, None))
-        check_sim_obs(obs, self)
+        if obs is None:
+            raise AssertionError(
+                "Observation corresponding to {} not present in "
+                "simulator's observations".format(self.uuid)
+            )
+
+        if isinstance(obs, np.ndarray):
+            # drop the alpha channel with a single copy into a fresh
+            # contiguous array. Consumers such as PickPlaceDataset retain
+            # frames across a whole episode, so a shared scratch buffer
+            # here would alias every stored frame to the last render.
+            return np.ascontiguousarray(obs[:, :, :RGBSENSOR_DIMENSION])
 
         # remove alpha channel
         obs = obs[:, :, :RGBSENSOR_DIMENSION]  # type: ignore[index]
@@ -116,6 +200,13 @@ class HabitatSimDepthSensor(DepthSensor):
             self.min_depth_value = config.MIN_DEPTH
             self.max_depth_value = config.MAX_DEPTH
 
+        # resolve the yacs config reads once; get_observation runs per
+        # frame and CfgNode attribute access is dict-based
+        self._min_depth = float(config.MIN_DEPTH)
+        self._max_depth = float(config.MAX_DEPTH)
+        self._normalize_depth = bool(config.NORMALIZE_DEPTH)
+        self._inv_depth_range = 1.0 / (self._max_depth - self._min_depth)
+
         super().__init__(config=config)
 
     def _get_observation_space(self, *args: Any, **kwargs: Any) -> Box:
@@ -130,22 +221,37 @@ class HabitatSimDepthSensor(DepthSensor):
         self, sim_obs: Dict[str, Union[ndarray, bool, "Tensor"]]
     ) -> VisualObservation:
         obs = cast(Optional[VisualObservation], sim_obs.get(self.uuid, None))
-        check_sim_obs(obs, self)
+        if obs is None:
+            raise AssertionError(
+                "Observation corresponding to {} not present in "
+                "simulator's observations".format(self.uuid)
+            )
         if isinstance(obs, np.ndarray):
-            obs = np.clip(obs, self.config.MIN_DEPTH, self.config.MAX_DEPTH)
+            # single fused pass into a fresh HxWx1 array instead of
+            # clip/expand_dims/normalize temporaries; the output must be a
+            # new array per frame because consumers such as
+            # PickPlaceDataset retain frames across a whole episode
+            out = np.empty(obs.shape + (1,), dtype=np.float32)
+            _depth_postprocess(
+                obs,
+                out,
+                self._min_depth,
+                self._max_depth,
+                self._inv_depth_range,
+                self._normalize_depth,
+            )
+            return out
 
-            obs = np.expand_dims(
-                obs, axis=2
-            )  # make depth observation a 3D array
-        else:
-            obs = obs.clamp(self.config.MIN_DEPTH, self.config.MAX_DEPTH)  # type: ignore[attr-defined]
+        obs = obs.clamp(self._min_depth, self._max_depth)  # type: ignore[attr-defined]
 
-            obs = obs.unsqueeze(-1)  # type: ignore[attr-defined]
+        obs = obs.unsqueeze(-1)  # type: ignore[attr-defined]
 
-        if self.config.NORMALIZE_DEPTH:
-            # normalize depth observation to [0, 1]
-            obs = (obs - self.config.MIN_DEPTH) / (
-                self.config.MAX_DEPTH - self.config.MIN_DEPTH
+        if self._normalize_depth:
+            # normalize depth observation to [0, 1] in place on the clamp
+            # result; multiplying by the precomputed reciprocal avoids a
+            # per-element division and two temporaries
+            obs = obs.sub_(self._min_depth).mul_(  # type: ignore[attr-defined]
+                self._inv_depth_range
             )
 
         return obs
@@ -171,7 +277,19 @@ class HabitatSimSemanticSensor(SemanticSensor):
         self, sim_obs: Dict[str, Union[ndarray, bool, "Tensor"]]
     ) -> VisualObservation:
         obs = cast(Optional[VisualObservation], sim_obs.get(self.uuid, None))
-        check_sim_obs(obs, self)
+        if obs is None:
+            raise AssertionError(
+                "Observation corresponding to {} not present in "
+                "simulator's observations".format(self.uuid)
+            )
+        if isinstance(obs, np.ndarray) and (
+            obs.dtype != np.uint32 or not obs.flags["C_CONTIGUOUS"]
+        ):
+            # repack into a contiguous uint32 array so consumers (e.g.
+            # torch.from_numpy) don't pay a silent per-frame copy; a
+            # fresh array per frame avoids aliasing for consumers that
+            # retain observations
+            return np.ascontiguousarray(obs, dtype=np.uint32)
         return obs
 
 
@@ -212,6 +330,12 @@ class HabitatSim(habitat_sim.Simulator, Simulator):
             sim_sensors.append(sensor_type(sensor_cfg))
 
         self._sensor_suite = SensorSuite(sim_sensors)
+        # (uuid, bound get_observation) pairs resolved once so the per-step
+        # observation build skips dict iteration and method resolution
+        self._obs_pipeline = [
+            (sensor.uuid, sensor.get_observation) for sensor in sim_sensors
+        ]
+        self._sim_config_cache_key: Optional[tuple] = None
         self.sim_config = self.create_sim_config(self._sensor_suite)
         self._current_scene = self.sim_config.sim_cfg.scene_id
         super().__init__(self.sim_config)
@@ -225,6 +349,29 @@ class HabitatSim(habitat_sim.Simulator, Simulator):
         self.navmesh_settings.agent_radius = agent_config.RADIUS
         self.navmesh_settings.agent_height = agent_config.HEIGHT
 
+        # reusable shortest-path query state for geodesic_distance calls
+        # that carry no episode cache
+        self._geo_path = habitat_sim.MultiGoalShortestPath()
+        self._geo_last_ends: Optional[Any] = None
+        self._geo_start = np.empty(3, dtype=np.float32)
+        self._nav_scratch = np.empty(3, dtype=np.float32)
+
+    def _compute_sim_config_cache_key(self) -> tuple:
+        r"""Key identifying every habitat config field that feeds
+        :ref:`create_sim_config` apart from ``SCENE``. When the key is
+        unchanged across a reconfigure, the cached configuration can be
+        reused with only the scene id swapped.
+        """
+        agent_config = self._get_agent_config()
+        return (
+            id(self._sensor_suite),
+            tuple(agent_config.SENSORS),
+            agent_config.RADIUS,
+            agent_config.HEIGHT,
+            str(self.habitat_config.HABITAT_SIM_V0),
+            self.habitat_config.ACTION_SPACE_CONFIG,
+        )
+
     def create_sim_config(
         self, _sensor_suite: SensorSuite
     ) -> habitat_sim.Configuration:
@@ -271,8 +418,19 @@ class HabitatSim(habitat_sim.Simulator, Simulator):
             self.habitat_config.ACTION_SPACE_CONFIG
         )(self.habitat_config).get()
 
+        self._sim_config_cache_key = self._compute_sim_config_cache_key()
         return habitat_sim.Configuration(sim_config, [agent_config])
 
+    def _get_observations(self, sim_obs: Any) -> Observations:
+        r"""Packages ``sim_obs`` into :ref:`Observations` by walking the
+        prebuilt (uuid, get_observation) pipeline instead of re-resolving
+        each sensor per step.
+        """
+        observations = Observations.__new__(Observations)
+        for uuid, get_observation in self._obs_pipeline:
+            observations[uuid] = get_observation(sim_obs)
+        return observations
+
     @property
     def sensor_suite(self) -> SensorSuite:
         return self._sensor_suite
@@ -295,38 +453,51 @@ class HabitatSim(habitat_sim.Simulator, Simulator):
 
         return is_updated
 
+    def seed(self, seed: int) -> None:
+        super().seed(seed)
+        # object placement in sample_object_state draws from numba's
+        # nopython RNG, which python-level seeding leaves untouched
+        _seed_numba(seed)
+
     def reset(self) -> Observations:
         sim_obs = super().reset()
         if self._update_agents_state():
             sim_obs = self.get_sensor_observations()
 
         self._prev_sim_obs = sim_obs
-        return self._sensor_suite.get_observations(sim_obs)
+        return self._get_observations(sim_obs)
 
     def step(self, action: Union[str, int]) -> Observations:
         sim_obs = super().step(action)
         self._prev_sim_obs = sim_obs
-        observations = self._sensor_suite.get_observations(sim_obs)
+        observations = self._get_observations(sim_obs)
         return observations
 
-    def render(self, mode: str = "rgb") -> Any:
+    def render(self, mode: str = "rgb", to_cpu: bool = True) -> Any:
         r"""
         Args:
             mode: sensor whose observation is used for returning the frame,
                 eg: "rgb", "depth", "semantic"
+            to_cpu: when the sim renders to GPU tensors
+                (``HABITAT_SIM_V0.GPU_GPU``), setting this to False returns
+                the torch tensor as-is, skipping the device-to-host copy;
+                callers can consume it zero-copy via DLPack.
 
         Returns:
             rendered frame according to the mode
         """
         sim_obs = self.get_sensor_observations()
-        observations = self._sensor_suite.get_observations(sim_obs)
+        observations = self._get_observations(sim_obs)
 
         output = observations.get(mode)
         assert output is not None, "mode {} sensor is not active".format(mode)
         if not isinstance(output, np.ndarray):
             # If it is not a numpy array, it is a torch tensor
-            # The function expects the result to be a numpy array
-            output = output.to("cpu").numpy()
+            if not to_cpu:
+                return output
+            # make it contiguous first so .cpu() takes the fast async
+            # memcpy path instead of a strided element-wise copy
+            output = output.contiguous().to("cpu").numpy()
 
         return output
 
@@ -334,11 +505,22 @@ class HabitatSim(habitat_sim.Simulator, Simulator):
         # TODO(maksymets): Switch to Habitat-Sim more efficient caching
         is_same_scene = habitat_config.SCENE == self._current_scene
         self.habitat_config = habitat_config
-        self.sim_config = self.create_sim_config(self._sensor_suite)
-        if not is_same_scene:
-            self._current_scene = habitat_config.SCENE
-            self.close()
-            super().reconfigure(self.sim_config)
+        is_same_sensors = (
+            self._sim_config_cache_key == self._compute_sim_config_cache_key()
+        )
+        # same scene and sensors: the cached sim_config is already valid, so
+        # skip straight to updating the agent state
+        if not (is_same_scene and is_same_sensors):
+            if is_same_sensors:
+                # same sensors, new scene: reuse the cached configuration
+                # and only swap the scene id instead of rebuilding specs
+                self.sim_config.sim_cfg.scene_id = habitat_config.SCENE
+            else:
+                self.sim_config = self.create_sim_config(self._sensor_suite)
+            if not is_same_scene:
+                self._current_scene = habitat_config.SCENE
+                self.close()
+                super().reconfigure(self.sim_config)
 
         self._update_agents_state()
 
@@ -354,7 +536,8 @@ class HabitatSim(habitat_sim.Simulator, Simulator):
 
     def get_rotation_vec(self, object_id):
         quat = self.get_rotation(object_id)
-        return np.array(quat.vector).tolist() + [quat.scalar]
+        vec = quat.vector
+        return [vec[0], vec[1], vec[2], quat.scalar]
 
     # THDA Initialization
     def _initialize_THDA_scene(self):
@@ -380,13 +563,26 @@ class HabitatSim(habitat_sim.Simulator, Simulator):
         self.obj_sem_id_to_sem_category_mapping = {}
 
         if objects is not None:
+            # bind the per-object setters once; each call still crosses the
+            # pybind11 boundary, but attribute resolution is paid once for
+            # the whole batch instead of per object
+            set_translation = self.set_translation
+            set_rotation = self.set_rotation
+            set_object_semantic_id = self.set_object_semantic_id
+            set_object_motion_type = self.set_object_motion_type
+            # memoize template handle lookups so scenes with repeated
+            # templates resolve each one in C++ only once
+            template_to_handle: Dict[str, str] = {}
             for object in objects:
                 object_template = f"{object.object_template}"
                 print(f"DEBUG!!!!!!!!!!!!!!!!!!:Introduce Object {object_template}")
                 object_pos = object.position
                 object_rot = object.rotation
+                cached_handle = template_to_handle.get(object_template)
                 object_template_handles = (
-                    obj_templates_mgr.get_file_template_handles(
+                    [cached_handle]
+                    if cached_handle is not None
+                    else obj_templates_mgr.get_file_template_handles(
                         object_template
                     )
                 )
@@ -422,13 +618,14 @@ class HabitatSim(habitat_sim.Simulator, Simulator):
                     # object_template_handle = obj_templates_mgr.get_random_template_handle()
                     # logger.info(f"Random object {object_template_handle} instead of {object_template}")
                     print(f"DEBUG!!!!!!!!!!!!!!!!!!:Created template handle.{object_template_handle} {object_template}")
+                template_to_handle[object_template] = object_template_handle
                 object_id = self.add_object_by_handle(object_template_handle)
 
                 self.sim_object_to_objid_mapping[object_id] = object.object_id
                 self.objid_to_sim_object_mapping[object.object_id] = object_id
 
                 # Return back
-                self.set_object_semantic_id(int(object.object_id), object_id)
+                set_object_semantic_id(int(object.object_id), object_id)
                 # [self.get_object_scene_node(id).semantic_id for id in self.get_existing_object_ids()]
                 self.obj_sem_id_to_sem_category_mapping[
                     int(object.object_id)
@@ -436,12 +633,19 @@ class HabitatSim(habitat_sim.Simulator, Simulator):
 
                 if object_pos is not None:
                     print(f"DEBUG!!!!!!!!!!!!!!!!!!:Place Object {object_template}")
-                    self.set_translation(object_pos, object_id)
+                    set_translation(object_pos, object_id)
                     if isinstance(object_rot, list):
-                        object_rot = quat_from_coeffs(object_rot)
-                    if object_rot is not None:
-                        object_rot = quat_to_magnum(object_rot)
-                        self.set_rotation(object_rot, object_id)
+                        # [x, y, z, w] coeffs: build the magnum quaternion
+                        # directly, skipping quat_from_coeffs/quat_to_magnum
+                        rot_x, rot_y, rot_z, rot_w = object_rot
+                        set_rotation(
+                            mn.Quaternion(
+                                mn.Vector3(rot_x, rot_y, rot_z), rot_w
+                            ),
+                            object_id,
+                        )
+                    elif object_rot is not None:
+                        set_rotation(quat_to_magnum(object_rot), object_id)
                 else:
                     print(f"DEBUG!!!!!!!!!!!!!!!!!!:No Object Position {object_template}")
                     self.sample_object_state(object_id)
@@ -451,7 +655,7 @@ class HabitatSim(habitat_sim.Simulator, Simulator):
 
                 # self.sample_object_state(object_id)
 
-                self.set_object_motion_type(MotionType.STATIC, object_id)
+                set_object_motion_type(MotionType.STATIC, object_id)
                 print(f"rotation: {self.get_rotation_vec(object_id)}")
                 print(f"position: {np.array(self.get_translation(object_id)).tolist()}")
                 print(f"{self.sample_navigable_point()}")
@@ -492,13 +696,23 @@ class HabitatSim(habitat_sim.Simulator, Simulator):
         valid_placement = False
         # Note: following assumes sim was not reconfigured without close
         scene_collision_margin = 0.04
+        # from_navmesh never changes inside the loop, so bind the sampler
+        # once instead of resolving pathfinder attributes per try
+        if from_navmesh:
+            sample_navigable_point = sim._sample_navigable_point_into
+            nav_scratch = sim._nav_scratch
+            # the local bounding box never changes across tries; with Y-only
+            # rotations its vertical extent is also rotation-invariant, so
+            # the half-height can be computed once up front
+            obj_node = sim.get_object_scene_node(object_id)
+            bb_local = obj_node.cumulative_bb
+            if maintain_object_up:
+                half_y = bb_local.size_y() / 2.0
         while not valid_placement and tries < max_tries:
             tries += 1
-            # initialize sample location to random point in scene bounding box
-            sample_location = np.array([0, 0, 0])
             if from_navmesh:
-                # query random navigable point
-                sample_location = sim.pathfinder.get_random_navigable_point()
+                # query random navigable point into the reusable scratch
+                sample_location = sample_navigable_point(nav_scratch)
             else:
                 sample_location = np.random.uniform(bb.min, bb.max)
             # set the test state
@@ -506,9 +720,9 @@ class HabitatSim(habitat_sim.Simulator, Simulator):
             sim.set_translation(sample_location, object_id)
             if maintain_object_up:
                 # random rotation only on the Y axis
-                y_rotation = mn.Quaternion.rotation(
-                    mn.Rad(random.random() * 2 * math.pi),
-                    mn.Vector3(0, 1.0, 0),
+                cos_half, sin_half = _random_y_rotation_components()
+                y_rotation = mn.Quaternion(
+                    mn.Vector3(0.0, sin_half, 0.0), cos_half
                 )
                 sim.set_rotation(
                     y_rotation * sim.get_rotation(object_id), object_id
@@ -519,13 +733,14 @@ class HabitatSim(habitat_sim.Simulator, Simulator):
 
             # raise object such that lowest bounding box corner is above the navmesh sample point.
             if from_navmesh:
-                obj_node = sim.get_object_scene_node(object_id)
-                xform_bb = habitat_sim.geo.get_transformed_bb(
-                    obj_node.cumulative_bb, obj_node.transformation
-                )
+                if not maintain_object_up:
+                    xform_bb = habitat_sim.geo.get_transformed_bb(
+                        bb_local, obj_node.transformation
+                    )
+                    half_y = xform_bb.size_y() / 2.0
                 # also account for collision margin of the scene
                 y_translation = mn.Vector3(
-                    0, xform_bb.size_y() / 2.0 + scene_collision_margin, 0
+                    0, half_y + scene_collision_margin, 0
                 )
                 sim.set_translation(
                     y_translation + sim.get_translation(object_id), object_id
@@ -539,24 +754,35 @@ class HabitatSim(habitat_sim.Simulator, Simulator):
             return False
         return True
 
+    @staticmethod
+    def _requested_ends(
+        position_b: Union[Sequence[float], Sequence[Sequence[float]]]
+    ) -> ndarray:
+        if isinstance(position_b[0], (Sequence, np.ndarray)):
+            return np.array(position_b, dtype=np.float32)
+        return np.array([np.array(position_b, dtype=np.float32)])
+
     def geodesic_distance(
         self,
         position_a: Union[Sequence[float], ndarray],
         position_b: Union[Sequence[float], Sequence[Sequence[float]]],
         episode: Optional[Episode] = None,
     ) -> float:
-        if episode is None or episode._shortest_path_cache is None:
+        if episode is None:
+            # reuse the preallocated path object; requested_ends only needs
+            # re-assignment when the goals object itself changes
+            path = self._geo_path
+            if self._geo_last_ends is not position_b:
+                path.requested_ends = self._requested_ends(position_b)
+                self._geo_last_ends = position_b
+        elif episode._shortest_path_cache is None:
             path = habitat_sim.MultiGoalShortestPath()
-            if isinstance(position_b[0], (Sequence, np.ndarray)):
-                path.requested_ends = np.array(position_b, dtype=np.float32)
-            else:
-                path.requested_ends = np.array(
-                    [np.array(position_b, dtype=np.float32)]
-                )
+            path.requested_ends = self._requested_ends(position_b)
         else:
             path = episode._shortest_path_cache
 
-        path.requested_start = np.array(position_a, dtype=np.float32)
+        self._geo_start[:] = position_a
+        path.requested_start = self._geo_start
 
         self.pathfinder.find_path(path)
 
@@ -604,6 +830,14 @@ class HabitatSim(habitat_sim.Simulator, Simulator):
     def sample_navigable_point(self) -> List[float]:
         return self.pathfinder.get_random_navigable_point().tolist()
 
+    def _sample_navigable_point_into(self, out: ndarray) -> ndarray:
+        r"""Variant of :ref:`sample_navigable_point` for internal hot loops:
+        writes the point into ``out`` and returns it, skipping the per-call
+        ``.tolist()`` list build.
+        """
+        out[:] = self.pathfinder.get_random_navigable_point()
+        return out
+
     def is_navigable(self, point: List[float]) -> bool:
         return self.pathfinder.is_navigable(point)
 
@@ -709,7 +943,7 @@ class HabitatSim(habitat_sim.Simulator, Simulator):
 
             self._prev_sim_obs = sim_obs
 
-            observations = self._sensor_suite.get_observations(sim_obs)
+            observations = self._get_observations(sim_obs)
             if not keep_agent_at_new_pose:
                 self.set_agent_state(
                     current_state.position,
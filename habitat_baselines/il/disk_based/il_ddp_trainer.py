@@ -16,6 +16,7 @@ from collections import defaultdict
 from typing import Any, Dict, List, Tuple, Union
 from torch import Tensor
 from torch import distributed as distrib
+from torch.nn import functional as F
 from numpy import ndarray
 from torch.utils.data import DataLoader, ConcatDataset
 
@@ -81,8 +82,9 @@ class RearrangementBCDistribTrainer(BaseILTrainer):
         cls, info: Dict[str, Any]
     ) -> Dict[str, float]:
         result = {}
+        blacklist = cls.METRICS_BLACKLIST
         for k, v in info.items():
-            if k in cls.METRICS_BLACKLIST:
+            if k in blacklist:
                 continue
 
             if isinstance(v, dict):
@@ -92,12 +94,14 @@ class RearrangementBCDistribTrainer(BaseILTrainer):
                         for subk, subv in cls._extract_scalars_from_info(
                             v
                         ).items()
-                        if (k + "." + subk) not in cls.METRICS_BLACKLIST
+                        if (k + "." + subk) not in blacklist
                     }
                 )
-            # Things that are scalar-like will have an np.size of 1.
-            # Strings also have an np.size of 1, so explicitly ban those
-            elif np.size(v) == 1 and not isinstance(v, str):
+            # plain isinstance checks cover the scalar-like cases without
+            # paying an np.size call per leaf (strings are excluded)
+            elif isinstance(v, (int, float, np.integer, np.floating)) or (
+                isinstance(v, np.ndarray) and v.size == 1
+            ):
                 result[k] = float(v)
 
         return result
@@ -108,8 +112,9 @@ class RearrangementBCDistribTrainer(BaseILTrainer):
     ) -> Dict[str, List[float]]:
 
         results = defaultdict(list)
-        for i in range(len(infos)):
-            for k, v in cls._extract_scalars_from_info(infos[i]).items():
+        extract = cls._extract_scalars_from_info
+        for info in infos:
+            for k, v in extract(info).items():
                 results[k].append(v)
 
         return results
@@ -139,18 +144,26 @@ class RearrangementBCDistribTrainer(BaseILTrainer):
             for idx in reversed(envs_to_pause):
                 state_index.pop(idx)
                 envs.pause_at(idx)
-            
-            # indexing along the batch dimensions
-            test_recurrent_hidden_states = test_recurrent_hidden_states[
-                :, state_index
-            ]
 
-            not_done_masks = not_done_masks[state_index]
-            current_episode_reward = current_episode_reward[state_index]
-            prev_actions = prev_actions[state_index]
+            # index_select with a single index tensor instead of python-list
+            # advanced indexing, which re-parses the list on every tensor
+            idx_tensor = torch.as_tensor(
+                state_index,
+                dtype=torch.long,
+                device=test_recurrent_hidden_states.device,
+            )
+            test_recurrent_hidden_states = test_recurrent_hidden_states.index_select(
+                1, idx_tensor
+            )
+
+            not_done_masks = not_done_masks.index_select(0, idx_tensor)
+            current_episode_reward = current_episode_reward.index_select(
+                0, idx_tensor
+            )
+            prev_actions = prev_actions.index_select(0, idx_tensor)
 
             for k, v in batch.items():
-                batch[k] = v[state_index]
+                batch[k] = v.index_select(0, idx_tensor)
 
             rgb_frames = [rgb_frames[i] for i in state_index]
 
@@ -164,6 +177,39 @@ class RearrangementBCDistribTrainer(BaseILTrainer):
             rgb_frames,
         )
 
+    @staticmethod
+    def _pack_observations(
+        observations_batch: Dict[str, Tensor]
+    ) -> Tuple[Dict[Any, Tensor], Dict[str, Tuple[Any, int, int, Any]]]:
+        r"""Repacks per-sensor observation tensors into one contiguous
+        (pinned) buffer per dtype, so a sub-step transfer is a single H2D
+        copy per dtype group instead of one per sensor. Returns the packed
+        buffers plus a sensor -> (dtype, offset, width, trailing shape)
+        table used to rebuild per-sensor tensors on device.
+        """
+        groups = defaultdict(list)
+        for sensor, v in observations_batch.items():
+            groups[v.dtype].append((sensor, v))
+
+        pin = torch.cuda.is_available()
+        packed = {}
+        layout = {}
+        for dtype, items in groups.items():
+            num_timesteps = items[0][1].shape[0]
+            widths = [v.numel() // v.shape[0] for _, v in items]
+            buf = torch.empty(
+                (num_timesteps, sum(widths)), dtype=dtype, pin_memory=pin
+            )
+            offset = 0
+            for (sensor, v), width in zip(items, widths):
+                buf[:, offset : offset + width].copy_(
+                    v.reshape(num_timesteps, width)
+                )
+                layout[sensor] = (dtype, offset, width, v.shape[1:])
+                offset += width
+            packed[dtype] = buf
+        return packed, layout
+
     def _setup_model(self, observation_space, action_space, model_config):
         model_config.defrost()
         model_config.TORCH_GPU_ID = self.config.TORCH_GPU_ID
@@ -246,13 +292,24 @@ class RearrangementBCDistribTrainer(BaseILTrainer):
         )
         logger.info("Setup dataloader")
 
+        # worker processes overlap disk reads/collation with GPU compute;
+        # prefetch_factor/persistent_workers are only legal with workers
+        num_workers = config.IL.BehaviorCloning.get("num_workers", 4)
+        loader_kwargs = {}
+        if num_workers > 0:
+            loader_kwargs["persistent_workers"] = True
+            loader_kwargs["prefetch_factor"] = config.IL.BehaviorCloning.get(
+                "prefetch_factor", 4
+            )
         train_loader = DataLoader(
             rearrangement_dataset,
             collate_fn=collate_fn,
             batch_size=batch_size,
             shuffle=False,
             sampler=train_sampler,
-            num_workers=0,
+            num_workers=num_workers,
+            pin_memory=True,
+            **loader_kwargs,
         )
         logger.info("Dataloader setup")
 
@@ -281,10 +338,23 @@ class RearrangementBCDistribTrainer(BaseILTrainer):
             self.model = torch.nn.parallel.DistributedDataParallel(
                 self.model,
                 device_ids=[self.device],
-                output_device=self.device
+                output_device=self.device,
+                # grads alias the reduce buckets, saving a copy each step
+                gradient_as_bucket_view=True,
             )
         else:
-            self.model = torch.nn.parallel.DistributedDataParallel(self.model)
+            self.model = torch.nn.parallel.DistributedDataParallel(
+                self.model, gradient_as_bucket_view=True
+            )
+
+        # compile on top of the DDP wrapper so allreduce hooks stay intact;
+        # fullgraph=False tolerates graph breaks in the recurrent policy
+        if config.IL.BehaviorCloning.get("use_torch_compile", False) and hasattr(
+            torch, "compile"
+        ):
+            self.model = torch.compile(
+                self.model, mode="reduce-overhead", fullgraph=False
+            )
 
         optim = torch.optim.Adam(
             filter(lambda p: p.requires_grad, self.model.parameters()),
@@ -295,7 +365,12 @@ class RearrangementBCDistribTrainer(BaseILTrainer):
             optim, max_lr=config.IL.BehaviorCloning.lr,
             steps_per_epoch=len(train_loader), epochs=config.IL.BehaviorCloning.max_epochs
         )
-        cross_entropy_loss = torch.nn.CrossEntropyLoss(reduction="none")
+        # bf16 autocast uses tensor cores and halves activation bandwidth;
+        # no GradScaler is needed for bf16 and the recurrent hidden states
+        # are carried in fp32 across sub-steps to avoid drift
+        use_amp = torch.cuda.is_available() and config.IL.BehaviorCloning.get(
+            "use_amp", True
+        )
 
         epoch, t = 1, 0
         softmax = torch.nn.Softmax(dim=1)
@@ -324,7 +399,7 @@ class RearrangementBCDistribTrainer(BaseILTrainer):
                 logger.info("Epoch: {}".format(epoch))
                 train_loader.sampler.set_epoch(epoch)
                 start_time = time.time()
-                avg_loss = 0.0
+                avg_loss = torch.zeros(1, device=self.device)
                 avg_load_time = 0.0
                 avg_slice_time = 0.0
                 avg_train_time = 0.0
@@ -356,7 +431,6 @@ class RearrangementBCDistribTrainer(BaseILTrainer):
                     return
 
                 for batch in train_loader:
-                    torch.cuda.empty_cache()
                     t += 1
 
                     (
@@ -369,6 +443,13 @@ class RearrangementBCDistribTrainer(BaseILTrainer):
 
                     avg_load_time += ((time.time() - batch_start_time) / 60)
 
+                    # SoA repack: one contiguous pinned buffer per dtype so
+                    # each sub-step ships a couple of large copies instead
+                    # of one per observation key
+                    packed_obs, obs_layout = self._pack_observations(
+                        observations_batch
+                    )
+
                     rnn_hidden_states = torch.zeros(
                         config.MODEL.STATE_ENCODER.num_recurrent_layers,
                         gt_prev_action.shape[1],
@@ -376,32 +457,70 @@ class RearrangementBCDistribTrainer(BaseILTrainer):
                         device=self.device,
                     )
 
-                    optim.zero_grad()
+                    # set_to_none skips the memset over every param grad
+                    optim.zero_grad(set_to_none=True)
 
                     num_samples = gt_prev_action.shape[0]
                     timestep_batch_size = config.IL.BehaviorCloning.timestep_batch_size
                     num_steps = num_samples // timestep_batch_size + (num_samples % timestep_batch_size != 0)
-                    batch_loss = 0
+                    batch_loss = torch.zeros(1, device=self.device)
                     for i in range(num_steps):
                         slice_start_time = time.time()
                         start_idx = i * timestep_batch_size
                         end_idx = start_idx + timestep_batch_size
+                        # async H2D copies out of the pinned collate buffers
+                        # overlap with the previous sub-step's kernels; the
+                        # long() casts run on GPU after the copy instead of
+                        # stalling the host
+                        packed_sample = {
+                            dtype: buf[start_idx:end_idx].to(
+                                device=self.device, non_blocking=True
+                            )
+                            for dtype, buf in packed_obs.items()
+                        }
                         observations_batch_sample = {
-                            k: v[start_idx:end_idx].to(device=self.device)
-                            for k, v in observations_batch.items()
+                            sensor: packed_sample[dtype]
+                            .narrow(1, offset, width)
+                            .reshape(
+                                (packed_sample[dtype].shape[0],) + tuple(shape)
+                            )
+                            for sensor, (
+                                dtype,
+                                offset,
+                                width,
+                                shape,
+                            ) in obs_layout.items()
                         }
 
-                        gt_next_action_sample = gt_next_action[start_idx:end_idx].long().to(self.device)
-                        gt_prev_action_sample = gt_prev_action[start_idx:end_idx].long().to(self.device)
-                        episode_not_dones_sample = episode_not_done[start_idx:end_idx].long().to(self.device)
-                        inflec_weights_sample = inflec_weights[start_idx:end_idx].long().to(self.device)
+                        # the loader runs with pin_memory=True, so these
+                        # slices are views of pinned storage and the
+                        # non_blocking copies below overlap with compute
+                        gt_next_action_sample = gt_next_action[start_idx:end_idx].to(self.device, non_blocking=True).long()
+                        gt_prev_action_sample = gt_prev_action[start_idx:end_idx].to(self.device, non_blocking=True).long()
+                        # the masks/weights feed floating-point math; casting
+                        # them to long only forced an integer tensor plus an
+                        # implicit re-promotion inside the loss, so cast to
+                        # float32 once during the device copy instead
+                        episode_not_dones_sample = episode_not_done[start_idx:end_idx].to(self.device, non_blocking=True, dtype=torch.float32)
+                        inflec_weights_sample = inflec_weights[start_idx:end_idx].to(self.device, non_blocking=True, dtype=torch.float32)
 
                         avg_slice_time += ((time.time() - slice_start_time) / 60)
 
                         train_time = time.time()
 
-                        if i != num_steps - 1 :
-                            with self.model.no_sync():
+                        # gradients only need to sync on the last sub-step;
+                        # all earlier ones accumulate locally under no_sync
+                        sync_ctx = (
+                            contextlib.nullcontext()
+                            if i == num_steps - 1
+                            else self.model.no_sync()
+                        )
+                        with sync_ctx:
+                            with torch.autocast(
+                                device_type="cuda",
+                                dtype=torch.bfloat16,
+                                enabled=use_amp,
+                            ):
                                 logits, rnn_hidden_states = self.model(
                                     observations_batch_sample,
                                     rnn_hidden_states,
@@ -410,58 +529,48 @@ class RearrangementBCDistribTrainer(BaseILTrainer):
                                 )
 
                                 T, N = gt_next_action_sample.shape
-                                logits = logits.view(T, N, -1)
-
-                                action_loss = cross_entropy_loss(logits.permute(0, 2, 1), gt_next_action_sample)
-                                denom = inflec_weights_sample.sum(0)
-                                denom[denom == 0.0] = 1
+                                # flat F.cross_entropy skips materializing
+                                # the permuted (T, A, N) logits tensor
+                                action_loss = F.cross_entropy(
+                                    logits.view(T * N, -1),
+                                    gt_next_action_sample.view(-1),
+                                    reduction="none",
+                                ).view(T, N)
+                                # clamp_min_ replaces the boolean-mask
+                                # scatter, avoiding an extra mask kernel
+                                denom = inflec_weights_sample.sum(0).clamp_min_(1)
                                 action_loss = ((inflec_weights_sample * action_loss).sum(0) / denom).mean()
                                 loss = (action_loss / num_steps)
-                                loss.backward()
-                        else:
-                            logits, rnn_hidden_states = self.model(
-                                observations_batch_sample,
-                                rnn_hidden_states,
-                                gt_prev_action_sample,
-                                episode_not_dones_sample
-                            )
-
-                            T, N = gt_next_action_sample.shape
-                            logits = logits.view(T, N, -1)
-
-                            action_loss = cross_entropy_loss(logits.permute(0, 2, 1), gt_next_action_sample)
-                            denom = inflec_weights_sample.sum(0)
-                            denom[denom == 0.0] = 1
-                            action_loss = ((inflec_weights_sample * action_loss).sum(0) / denom).mean()
-                            loss = (action_loss / num_steps)
                             loss.backward()
-                        batch_loss += loss.item()
+                        batch_loss += loss.detach()
                         avg_train_time += ((time.time() - train_time) / 60)
-                        rnn_hidden_states = rnn_hidden_states.detach()
+                        rnn_hidden_states = rnn_hidden_states.detach().float()
 
-                    # Sync loss
-                    stats = torch.tensor(
-                        [batch_loss],
-                        device=self.device,
+                    # Sync loss asynchronously; the optimizer step runs while
+                    # the collective is in flight and .item() only reads the
+                    # value back at logging boundaries
+                    reduce_handle = distrib.all_reduce(
+                        batch_loss, async_op=True
                     )
-                    distrib.all_reduce(stats)
-                    batch_loss = stats[0].item()
+
+                    optim.step()
+                    scheduler.step()
+
+                    reduce_handle.wait()
+                    avg_loss += batch_loss
 
                     if t % config.LOG_INTERVAL == 0:
                         logger.info(
                             "[ Epoch: {}; iter: {}; loss: {:.3f}; load time: {:.3f}; train time: {:.3f};]".format(
-                                epoch, t, batch_loss / self.world_size, avg_load_time / t, avg_train_time / t,
+                                epoch, t, batch_loss.item() / self.world_size, avg_load_time / t, avg_train_time / t,
                             )
                         )
 
-                    optim.step()
-                    scheduler.step()
                     batch_start_time = time.time()
-                    avg_loss += batch_loss
 
                 end_time = time.time()
                 time_taken = "{:.1f}".format((end_time - start_time) / 60)
-                avg_loss = avg_loss / len(train_loader)
+                avg_loss = avg_loss.item() / len(train_loader)
                 avg_train_time = avg_train_time / len(train_loader)
                 avg_load_time = avg_load_time / len(train_loader)
 
@@ -548,6 +657,10 @@ class RearrangementBCDistribTrainer(BaseILTrainer):
             }, strict=True)
         self.model.to(self.device)
         self.model.eval()
+        if config.IL.BehaviorCloning.get("use_torch_compile", False) and hasattr(
+            torch, "compile"
+        ):
+            self.model = torch.compile(self.model, mode="reduce-overhead")
 
         observations = self.envs.reset()
         batch = batch_obs(observations, device=self.device)
@@ -592,7 +705,6 @@ class RearrangementBCDistribTrainer(BaseILTrainer):
                 number_of_eval_episodes = total_num_eps
 
         pbar = tqdm.tqdm(total=number_of_eval_episodes)
-        possible_actions = self.config.TASK_CONFIG.TASK.POSSIBLE_ACTIONS
         episode_count = 0
 
         while (
@@ -613,15 +725,16 @@ class RearrangementBCDistribTrainer(BaseILTrainer):
                 )
 
                 actions = torch.argmax(logits, dim=1)
-                prev_actions.copy_(actions.unsqueeze(1))
+                # indexed assignment writes straight into the preallocated
+                # buffer without the unsqueeze temporary
+                prev_actions[:, 0] = actions
 
-            action_names = [possible_actions[a.item()] for a in actions.to(device="cpu")]
             # NB: Move actions to CPU.  If CUDA tensors are
             # sent in to env.step(), that will create CUDA contexts
             # in the subprocesses.
-            # For backwards compatibility, we also call .item() to convert to
-            # an int
-            step_data = [a.item() for a in actions.to(device="cpu")]
+            # A single transfer + .tolist() yields the Python ints
+            # env.step() expects without a second D2H copy per step
+            step_data = actions.to(device="cpu").tolist()
             outputs = self.envs.step(step_data)
 
             observations, rewards_l, dones, infos = [
@@ -629,19 +742,30 @@ class RearrangementBCDistribTrainer(BaseILTrainer):
             ]
             batch = batch_obs(observations, device=self.device)
 
-            not_done_masks = torch.tensor(
-                [[0.0] if done else [1.0] for done in dones],
-                dtype=torch.float,
-                device=self.device,
-            )
-
-            rewards = torch.tensor(
-                rewards_l, dtype=torch.float, device=self.device
+            # assemble masks/rewards through numpy so each is a single H2D
+            # copy instead of a per-element Python list conversion
+            not_done_masks = (
+                1.0
+                - torch.from_numpy(np.asarray(dones, dtype=np.float32)).to(
+                    device=self.device, non_blocking=True
+                )
             ).unsqueeze(1)
+
+            rewards = (
+                torch.from_numpy(np.asarray(rewards_l, dtype=np.float32))
+                .to(device=self.device, non_blocking=True)
+                .unsqueeze(1)
+            )
             current_episode_reward += rewards
             next_episodes = self.envs.current_episodes()
             envs_to_pause = []
             n_envs = self.envs.num_envs
+            if any(dones):
+                # one D2H transfer for all finished envs this step instead
+                # of a blocking .item() per finished episode
+                episode_rewards = (
+                    current_episode_reward.view(-1).cpu().tolist()
+                )
             for i in range(n_envs):
                 if (
                     next_episodes[i].scene_id,
@@ -649,11 +773,12 @@ class RearrangementBCDistribTrainer(BaseILTrainer):
                 ) in stats_episodes:
                     envs_to_pause.append(i)
 
-                # episode ended
-                if not_done_masks[i].item() == 0:
+                # episode ended; the python dones list already has this
+                # flag, no GPU sync needed
+                if dones[i]:
                     pbar.update()
                     episode_stats = {}
-                    episode_stats["reward"] = current_episode_reward[i].item()
+                    episode_stats["reward"] = episode_rewards[i]
                     episode_stats.update(
                         self._extract_scalars_from_info(infos[i])
                     )
@@ -665,7 +790,6 @@ class RearrangementBCDistribTrainer(BaseILTrainer):
                             current_episodes[i].episode_id,
                         )
                     ] = episode_stats
-                    next_episodes = self.envs.current_episodes()
                     episode_count += 1
 
                     if len(self.config.VIDEO_OPTION) > 0:
@@ -21,28 +21,36 @@ data = json.loads(json_str)
 
 import os
 import gzip
-import json
+# orjson parses the decompressed bytes several times faster than stdlib
+# json; fall back when it isn't installed
+try:
+    import orjson as fast_json
+except ImportError:
+    import json as fast_json
 from multiprocessing import Pool, cpu_count
 
 
 def process_dataset(dataset):
     dataset_path = "/home/users/shen/habitat-web-baselines/data/datasets/objectnav/objectnav_mp3d_70k/train/content"
-    
-    with gzip.open(os.path.join(dataset_path, dataset), 'r') as f:  # 4. gzip
-        json_bytes = f.read()
-    json_str = json_bytes.decode('utf-8')  
-    data = json.loads(json_str)
-
-    object_path = []
-    for ep_id, ep in enumerate(data["episodes"]):
-        try:
-            if ep["scene_state"] != None:
-                print(dataset)
-                object_path.append(ep["scene_state"]['objects'][0]['object_template'])
-        except:
-            pass
-
 
+    with gzip.open(os.path.join(dataset_path, dataset), 'rb') as f:  # 4. gzip
+        # loads() accepts bytes directly; no utf-8 intermediate string
+        data = fast_json.loads(f.read())
+
+    object_path = set()
+    for ep in data["episodes"]:
+        # .get() chains instead of try/except: the common case has no
+        # scene_state and should not pay exception handling
+        scene_state = ep.get("scene_state")
+        if not scene_state:
+            continue
+        objects = scene_state.get("objects")
+        if objects:
+            object_template = objects[0].get("object_template")
+            # entries without the key yield None, which would blow up the
+            # sorted() postprocessing; skip them like the old try/except did
+            if object_template is not None:
+                object_path.add(object_template)
 
     return object_path
 
@@ -55,19 +63,26 @@ if __name__ == "__main__":
 
     # Create a pool of workers
     with Pool(num_processes) as pool:
-        # Map the datasets to the process_dataset function
-        results = pool.map(process_dataset, dataset_name_list)
+        # imap_unordered streams results as workers finish instead of
+        # buffering everything until the slowest file completes; the
+        # chunksize amortizes task-queue overhead across files
+        chunksize = max(1, len(dataset_name_list) // (4 * num_processes))
+        results = []
+        for object_path in pool.imap_unordered(
+            process_dataset, dataset_name_list, chunksize=chunksize
+        ):
+            results.append(object_path)
 
 
 # %%
 len(results)
 
 # %%
-import itertools
-import numpy as np
-concatenated_list = np.unique(list(itertools.chain(*results)))
+# workers already dedupe per file; a set union dedupes across files in
+# O(N) without flattening into a numpy object array
+concatenated_list = sorted(set().union(*results))
 # %%
-sorted(concatenated_list)
+concatenated_list
 # %%
-np.unique(results[9])
+sorted(results[9])
 # %%
@@ -2,75 +2,194 @@
 
 
 
+import io
 import os
 import gzip
-import json
+# orjson parses the decompressed bytes several times faster than stdlib
+# json; fall back when it isn't installed
+try:
+    import orjson as fast_json
+except ImportError:
+    import json as fast_json
+# python-isal's igzip is a drop-in gzip replacement backed by ISA-L's
+# vectorized CRC32 and deflate, roughly 3x faster on both sides; fall
+# back to stdlib zlib when it isn't installed
+try:
+    from isal import igzip as fast_gzip
+except ImportError:
+    fast_gzip = gzip
+from concurrent.futures import ThreadPoolExecutor
 from multiprocessing import Pool, cpu_count
+from operator import itemgetter
 
+dataset_path = "/home/users/shen/habitat-web-baselines/data/datasets/objectnav/objectnav_mp3d_70k/train/content"
+out_dir = "cleaned_dataset"
 
-def process_dataset(dataset):
-    dataset_path = "/home/users/shen/habitat-web-baselines/data/datasets/objectnav/objectnav_mp3d_70k/train/content"
-    
-    with gzip.open(os.path.join(dataset_path, dataset), 'r') as f:  # 4. gzip
-        json_bytes = f.read()
-    json_str = json_bytes.decode('utf-8')  
-    data = json.loads(json_str)
-
-    for ind_ep, episode in enumerate(data["episodes"]):
-        cleaned_action_ep = []
-        for ind_step, step in enumerate(episode["reference_replay"]):
-            if step['action'] not in ["LOOK_UP", "LOOK_DOWN"]:
-                step["agent_state"]["sensor_data"] = {
-                    "rgb": {
-                        "rotation": [
-                            0,
-                            0,
-                            0,
-                            1
-                        ],
-                        "position": [
-                            0,
-                            1.395,
-                            0
-                        ]
-                    },
-                    "semantic": {
-                        "rotation": [
-                            0,
-                            0,
-                            0,
-                            1
-                        ],
-                        "position": [
-                            0,
-                            1.395,
-                            0
-                        ]
-                    }
-                }
-                cleaned_action_ep.append(step)
-   
-        data["episodes"][ind_ep]["reference_replay"] = cleaned_action_ep
+# camera-turn actions stripped from the replays
+_DROP = frozenset({"LOOK_UP", "LOOK_DOWN"})
+
+# itemgetter resolves the key in C, skipping a bytecode-level subscript
+# per step in the hot loop
+_get_action = itemgetter('action')
+
+# every surviving step gets the same reset sensor pose; sharing one
+# object avoids rebuilding ~10 dict/list literals per step and the
+# serializer emits it identically either way
+_SENSOR_DATA = {
+    "rgb": {
+        "rotation": [0, 0, 0, 1],
+        "position": [0, 1.395, 0],
+    },
+    "semantic": {
+        "rotation": [0, 0, 0, 1],
+        "position": [0, 1.395, 0],
+    },
+}
+
+
+def _init_worker(path, out):
+    # forked children inherit the module globals anyway; setting them in
+    # the pool initializer keeps spawn start-methods working and lets
+    # callers point the pool at different dirs without editing the worker
+    global dataset_path, out_dir
+    dataset_path = path
+    out_dir = out
+
+
+if fast_json.__name__ == "orjson":
+    def _dumps(obj):
+        # no options is orjson's fastest path: bytes out, no key-sorting
+        # or indent passes
+        return fast_json.dumps(obj)
+else:
+    def _dumps(obj):
+        # compact separators skip the default whitespace emission in the
+        # stdlib fallback; ensure_ascii=False avoids escaping passes
+        return fast_json.dumps(
+            obj, separators=(",", ":"), ensure_ascii=False
+        ).encode('utf-8')
+
+
+def _read_dataset_bytes(dataset):
+    # a 128 KiB buffer feeds zlib in large chunks instead of the 8 KiB
+    # default, cutting syscalls and output-buffer resizes during the read
+    with io.BufferedReader(
+        fast_gzip.open(os.path.join(dataset_path, dataset), 'rb'),
+        buffer_size=128 * 1024,
+    ) as f:
+        return f.read()
+
+
+def _clean_dataset(dataset, json_bytes):
+    # loads() accepts bytes directly; no utf-8 intermediate string.
+    # A columnar reader (pyarrow.json) was considered but only handles
+    # newline-delimited input; these files are single nested documents,
+    # so the orjson parse + C-level filtering below stays the fast path.
+    data = fast_json.loads(json_bytes)
+
+    # local aliases keep the per-step work to LOAD_FAST + C calls
+    get_action = _get_action
+    drop = _DROP
+    sensor_data = _SENSOR_DATA
+    for episode in data["episodes"]:
+        cleaned_action_ep = episode["reference_replay"]
+        # most episodes have no camera turns; a cheap any() scan lets
+        # them keep their list instead of paying a same-length rebuild
+        if any(get_action(step) in drop for step in cleaned_action_ep):
+            # comprehension filter runs in C-level LIST_APPEND; slice
+            # assignment shrinks the episode's own list in place, so no
+            # write-back through data["episodes"] is needed
+            cleaned_action_ep[:] = [
+                step
+                for step in cleaned_action_ep
+                if get_action(step) not in drop
+            ]
+        for step in cleaned_action_ep:
+            step["agent_state"]["sensor_data"] = sensor_data
     
-    # If you need to save the processed data back, you can do it here
-    # with open(os.path.join(dataset_path, "processed_" + dataset), 'w') as f:
-    #    json.dump(data, f)
-    with gzip.open("cleaned_dataset/"+ dataset, "w") as f:
-        f.write(json_bytes)
+    # serialize episode-by-episode with bracket glue instead of one
+    # whole-tree dumps; the fragments are joined into a single buffer
+    # below for the one-shot compress, so this saves the serializer's
+    # recursive whole-document pass rather than peak memory
+    episodes = data.pop("episodes")
+    head = _dumps(data)
+    parts = []
+    append = parts.append
+    if head == b"{}":
+        append(b'{"episodes":[')
+    else:
+        append(head[:-1] + b',"episodes":[')
+    for ind, episode in enumerate(episodes):
+        if ind:
+            append(b",")
+        append(_dumps(episode))
+    append(b"]}")
+    # one zlib call over a single joined buffer; GzipFile.write would
+    # loop each fragment through an 8 KiB staging buffer and update the
+    # CRC per chunk from Python. Level 1 compresses this repetitive JSON
+    # several times faster than the default level 9 for near-identical
+    # ratio, and these files are only ever re-read sequentially.
+    payload = fast_gzip.compress(b"".join(parts), compresslevel=1)
+    with open(os.path.join(out_dir, dataset), "wb") as f:
+        f.write(payload)
+
 
+def process_dataset(dataset):
+    _clean_dataset(dataset, _read_dataset_bytes(dataset))
     return dataset
 
+
+def process_dataset_batch(datasets):
+    # the read is I/O-bound while parse/mutate/serialize are CPU-bound;
+    # a single prefetch thread reads the next file's compressed bytes
+    # while the main thread transforms the current one
+    with ThreadPoolExecutor(max_workers=1) as prefetcher:
+        pending = prefetcher.submit(_read_dataset_bytes, datasets[0])
+        for ind, dataset in enumerate(datasets):
+            json_bytes = pending.result()
+            if ind + 1 < len(datasets):
+                pending = prefetcher.submit(
+                    _read_dataset_bytes, datasets[ind + 1]
+                )
+            _clean_dataset(dataset, json_bytes)
+    return datasets
+
 if __name__ == "__main__":
-    dataset_path =  "/home/users/shen/habitat-web-baselines/data/datasets/objectnav/objectnav_mp3d_70k/train/content"
-    dataset_name_list = os.listdir(dataset_path)
+    # resolve once and create up front: a missing or CWD-relative output
+    # dir would otherwise make every worker fail only after doing all of
+    # its CPU work
+    out_dir = os.path.abspath(out_dir)
+    os.makedirs(out_dir, exist_ok=True)
+
+    # scandir caches stat results, so sorting largest-first costs no
+    # extra syscalls; scheduling the slowest files earliest keeps all
+    # cores busy through the tail of the run
+    entries = [e for e in os.scandir(dataset_path) if e.is_file()]
+    entries.sort(key=lambda e: e.stat().st_size, reverse=True)
+    dataset_name_list = [e.name for e in entries]
 
     # Determine the number of processes to use
     num_processes = cpu_count()
 
-    # Create a pool of workers
-    with Pool(num_processes) as pool:
-        # Map the datasets to the process_dataset function
-        results = pool.map(process_dataset, dataset_name_list)
+    # Create a pool of workers; recycling a worker every 32 files caps
+    # heap growth from fragmentation across thousands of datasets
+    with Pool(
+        num_processes,
+        initializer=_init_worker,
+        initargs=(dataset_path, out_dir),
+        maxtasksperchild=32,
+    ) as pool:
+        # imap_unordered streams results as workers finish instead of
+        # buffering everything until the slowest file completes; explicit
+        # batches of 4 amortize task-dispatch IPC (in place of chunksize)
+        # and give each worker a lookahead window to prefetch reads in
+        batches = [
+            dataset_name_list[i:i + 4]
+            for i in range(0, len(dataset_name_list), 4)
+        ]
+        results = []
+        for datasets in pool.imap_unordered(process_dataset_batch, batches):
+            results.extend(datasets)
 
 
 # %%